@@ -0,0 +1,146 @@
+"""
+Ambiente Vetorizado (Gymnasium) do Gêmeo Digital Econômico
+Simula milhares de campanhas em paralelo com as mesmas equações de demanda e
+LTV do Generator_NEW.py, para avaliar checkpoints CQL por rollouts em lote.
+"""
+
+import itertools
+import json
+
+import d3rlpy
+import gymnasium as gym
+import joblib
+import numpy as np
+import pandas as pd
+
+from economia import (
+    CENARIOS_ARTIGO, REGIOES, PLATAFORMAS,
+    categorical_features, numeric_features_base, numeric_features_memoria,
+    montar_estado, calcular_demanda, calcular_lucro, calcular_ltv, carregar_cenarios,
+)
+
+
+# Reset automático no mesmo passo (o enum só existe a partir do gymnasium 1.1)
+AUTORESET_MESMO_PASSO = getattr(getattr(gym.vector, "AutoresetMode", None), "SAME_STEP", "SameStep")
+
+
+class CampanhasVectorEnv(gym.vector.VectorEnv):
+    """Cada sub-ambiente é uma campanha; a cada passo uma nova campanha é sorteada.
+
+    Observações já vêm codificadas (OHE + scalers) na ordem esperada pelos agentes.
+    A ação é o preço normalizado (saída do agente) e a recompensa é o lucro
+    imediato (modo "venda_unica") ou o LTV (modo "assinatura"), em valores reais.
+    Episódios truncados reiniciam no mesmo passo; a observação final vem em
+    `infos["final_obs"]`.
+    """
+
+    def __init__(self, num_envs, ohe, scaler_estado, scaler_acao, scaler_memoria=None,
+                 modo="venda_unica", cenarios=CENARIOS_ARTIGO, horizonte=1, seed=None):
+        self.modo = modo
+        self.horizonte = horizonte
+        self.scaler_acao = scaler_acao
+        self._rng = np.random.default_rng(seed)
+
+        # Pré-codifica todas as combinações (cenário x região x plataforma) uma única vez;
+        # o passo do ambiente vira apenas um gather de índices.
+        combinacoes = list(itertools.product(range(len(cenarios)), REGIOES, PLATAFORMAS))
+        df = pd.DataFrame([montar_estado(cenarios[i], r, p) for i, r, p in combinacoes])
+        blocos = [ohe.transform(df[categorical_features]), scaler_estado.transform(df[numeric_features_base])]
+        if modo == "assinatura":
+            blocos.append(scaler_memoria.transform(df[numeric_features_memoria]))
+        self._observacoes = np.concatenate(blocos, axis=1).astype(np.float32)
+
+        idx_cenario = np.array([i for i, _, _ in combinacoes])
+        self._price_min = np.array([c['Price_Min'] for c in cenarios])[idx_cenario]
+        self._price_max = np.array([c['Price_Max'] for c in cenarios])[idx_cenario]
+        self._budget = np.array([c['Budget'] for c in cenarios])[idx_cenario]
+        self._cpa_target = np.array([c['CPA_Target'] for c in cenarios])[idx_cenario]
+        # Sorteia o cenário uniformemente (como no Generator) e região/plataforma dentro dele
+        self._n_por_cenario = len(REGIOES) * len(PLATAFORMAS)
+        self._n_cenarios = len(cenarios)
+
+        # Contrato do VectorEnv do gymnasium 1.x: o construtor base não recebe argumentos
+        self.num_envs = num_envs
+        self.single_observation_space = gym.spaces.Box(-np.inf, np.inf, shape=(self._observacoes.shape[1],), dtype=np.float32)
+        self.single_action_space = gym.spaces.Box(-1.0, 1.0, shape=(1,), dtype=np.float32)
+        self.observation_space = gym.vector.utils.batch_space(self.single_observation_space, num_envs)
+        self.action_space = gym.vector.utils.batch_space(self.single_action_space, num_envs)
+        self.metadata = {"autoreset_mode": AUTORESET_MESMO_PASSO}
+
+        self._estado = np.zeros(num_envs, dtype=np.int64)
+        self._passos = np.zeros(num_envs, dtype=np.int64)
+
+    def _sortear(self, n):
+        cenario = self._rng.integers(self._n_cenarios, size=n)
+        return cenario * self._n_por_cenario + self._rng.integers(self._n_por_cenario, size=n)
+
+    def reset(self, *, seed=None, options=None):
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        self._estado = self._sortear(self.num_envs)
+        self._passos[:] = 0
+        return self._observacoes[self._estado], {}
+
+    def step(self, actions):
+        idx = self._estado
+        actions = np.asarray(actions, dtype=np.float64).reshape(self.num_envs, -1)
+        preco = np.maximum(0.0, self.scaler_acao.inverse_transform(actions)[:, 0])
+        cpa = self._cpa_target[idx] * self._rng.uniform(0.9, 1.1, size=self.num_envs)
+
+        if self.modo == "assinatura":
+            recompensa = calcular_ltv(preco, cpa)
+        else:
+            conversoes = calcular_demanda(preco, self._price_min[idx], self._price_max[idx], self._budget[idx])
+            recompensa = calcular_lucro(conversoes, preco, cpa)
+
+        # Campanhas são independentes: o próximo estado é sempre uma nova campanha,
+        # e o episódio é truncado (com reset automático) ao atingir o horizonte.
+        self._passos += 1
+        truncados = self._passos >= self.horizonte
+        self._passos[truncados] = 0
+        self._estado = self._sortear(self.num_envs)
+
+        terminados = np.zeros(self.num_envs, dtype=bool)
+        infos = {"preco": preco, "cenario": idx // self._n_por_cenario}
+        if truncados.any():
+            # A observação sorteada encerra o episódio; o reset sorteia outra campanha
+            infos["final_obs"] = self._observacoes[self._estado]
+            infos["_final_obs"] = truncados
+            self._estado[truncados] = self._sortear(int(truncados.sum()))
+        return self._observacoes[self._estado], recompensa, terminados, truncados, infos
+
+
+def avaliar_checkpoint(cql, env, n_passos=10):
+    """Rollout em lote da política gulosa; devolve métricas agregadas em valores reais."""
+    obs, _ = env.reset()
+    recompensas, precos = [], []
+    for _ in range(n_passos):
+        acoes = cql.predict(obs)
+        obs, recompensa, _, _, infos = env.step(acoes)
+        recompensas.append(recompensa)
+        precos.append(infos["preco"])
+    recompensas = np.concatenate(recompensas)
+    return {
+        "recompensa_media": float(recompensas.mean()),
+        "recompensa_desvio": float(recompensas.std()),
+        "var_5": float(np.percentile(recompensas, 5)),
+        "preco_medio": float(np.concatenate(precos).mean()),
+        "n_amostras": int(len(recompensas)),
+    }
+
+
+if __name__ == "__main__":
+    ohe = joblib.load("ohe_encoder.joblib")
+    scaler_estado = joblib.load("scaler_estado.joblib")
+    cenarios = carregar_cenarios()
+
+    env_fixo = CampanhasVectorEnv(4096, ohe, scaler_estado, joblib.load("scaler_acao.joblib"), cenarios=cenarios, seed=42)
+    cql_fixo = d3rlpy.load_learnable("modelo_rl_final.pt", device="cpu")
+    print("RL Venda Única:", json.dumps(avaliar_checkpoint(cql_fixo, env_fixo), indent=2))
+
+    env_sub = CampanhasVectorEnv(
+        4096, ohe, scaler_estado, joblib.load("scaler_assinatura_acao.joblib"),
+        scaler_memoria=joblib.load("scaler_assinatura_memoria.joblib"), modo="assinatura", cenarios=cenarios, seed=42,
+    )
+    cql_sub = d3rlpy.load_learnable("modelo_rl_assinatura.pt", device="cpu")
+    print("RL Assinatura:", json.dumps(avaliar_checkpoint(cql_sub, env_sub), indent=2))
@@ -0,0 +1,119 @@
+"""
+Integridade e Cache de Artefatos (Content-Addressed)
+Hashes de conteúdo para o cache de cenários do Generator e manifesto de
+artefatos validado pelo start.py (por hash, não só por presença).
+"""
+
+import hashlib
+import json
+import os
+
+CAMINHO_MANIFESTO = "artefatos_manifest.json"
+CAMINHO_CONFIG_MERCADO = "config_market.json"
+
+# Artefatos produzidos pelo train_pipeline.py (Generator + notebooks)
+ARTEFATOS_PIPELINE = [
+    "modelo_rl_final.pt",
+    "modelo_rl_assinatura.pt",
+    "sl_profit_regressor_model.joblib",
+    "ohe_encoder.joblib",
+    "scaler_estado.joblib",
+    "scaler_acao.joblib",
+    "scaler_recompensa.joblib",
+    "scaler_assinatura_memoria.joblib",
+    "scaler_assinatura_acao.joblib",
+    "scaler_assinatura_recompensa.joblib",
+    "colunas_estado_base.json",
+    "colunas_estado_assinatura.json",
+    "rl_offline_buffer.h5",
+    "rl_assinatura_buffer.h5",
+]
+
+# Manifestos dos ensembles multi-seed (treino_ensemble.py), opcionais
+MANIFESTOS_ENSEMBLE = ["ensemble_venda_unica.json", "ensemble_assinatura.json"]
+
+
+def hash_conteudo(obj):
+    """SHA-256 de um objeto JSON-serializável (ordem de chaves canônica)."""
+    return hashlib.sha256(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def hash_arquivo(caminho, bloco=1 << 20):
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for parte in iter(lambda: f.read(bloco), b""):
+            sha.update(parte)
+    return sha.hexdigest()
+
+
+def hash_config_mercado(caminho=CAMINHO_CONFIG_MERCADO):
+    """Hash do config de mercado (None se ainda não foi configurado)."""
+    return hash_arquivo(caminho) if os.path.exists(caminho) else None
+
+
+def escrever_manifesto(arquivos, config_hash, caminho=CAMINHO_MANIFESTO):
+    """Registra o hash de cada artefato existente e do config de mercado usado.
+
+    `config_hash` é o hash do config lido no início do treino (hash_config_mercado).
+    """
+    manifesto = {
+        "config_market": config_hash,
+        "arquivos": {a: hash_arquivo(a) for a in arquivos if os.path.exists(a)},
+    }
+    with open(caminho, "w") as f:
+        json.dump(manifesto, f, indent=4)
+    return manifesto
+
+
+def inicializar_manifesto(arquivos, caminho=CAMINHO_MANIFESTO):
+    """Cria o manifesto para instalações anteriores a ele, sem forçar re-treino.
+
+    Só age se o manifesto não existe e todos os artefatos estão presentes: os
+    arquivos atuais e o config_market.json vigente passam a ser a referência.
+    Devolve True se o manifesto foi criado.
+    """
+    if os.path.exists(caminho) or not all(os.path.exists(a) for a in arquivos):
+        return False
+    escrever_manifesto(arquivos, config_hash=hash_config_mercado(), caminho=caminho)
+    return True
+
+
+def validar_manifesto(arquivos, caminho=CAMINHO_MANIFESTO):
+    """Lista de problemas (vazia se tudo confere): ausentes, alterados ou config divergente."""
+    problemas = [f"{a} (ausente)" for a in arquivos if not os.path.exists(a)]
+    if problemas:
+        return problemas
+    if not os.path.exists(caminho):
+        return [f"{caminho} (ausente)"]
+
+    with open(caminho, "r") as f:
+        manifesto = json.load(f)
+    if manifesto.get("config_market") != hash_config_mercado():
+        problemas.append(f"{CAMINHO_CONFIG_MERCADO} (alterado desde o último treino)")
+    registrados = manifesto.get("arquivos", {})
+    for a in arquivos:
+        if registrados.get(a) != hash_arquivo(a):
+            problemas.append(f"{a} (hash diverge do manifesto)")
+    return problemas
+
+
+def registrar_no_manifesto(arquivos, caminho=CAMINHO_MANIFESTO):
+    """Acrescenta o hash de artefatos gerados fora do pipeline (ex.: ensembles)."""
+    manifesto = {"config_market": hash_config_mercado(), "arquivos": {}}
+    if os.path.exists(caminho):
+        with open(caminho, "r") as f:
+            manifesto = json.load(f)
+    manifesto["arquivos"].update({a: hash_arquivo(a) for a in arquivos})
+    with open(caminho, "w") as f:
+        json.dump(manifesto, f, indent=4)
+    return manifesto
+
+
+def validar_ensemble(caminho_ensemble, caminho=CAMINHO_MANIFESTO):
+    """Problemas de um manifesto de ensemble: buffer re-treinado ou membros fora do manifesto."""
+    with open(caminho_ensemble, "r") as f:
+        ensemble = json.load(f)
+    buffer = ensemble.get("buffer")
+    if not buffer or not os.path.exists(buffer) or ensemble.get("buffer_hash") != hash_arquivo(buffer):
+        return [f"{buffer} (buffer mudou desde o treino do ensemble)"]
+    return validar_manifesto([caminho_ensemble] + ensemble["membros"], caminho)
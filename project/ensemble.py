@@ -0,0 +1,99 @@
+"""
+Ensemble de Agentes CQL (Multi-Seed) para Serviço em Lote
+Empilha os pesos do ator e dos críticos de quantis de N agentes treinados com
+sementes diferentes e avalia todos em um único forward batelado (bmm).
+Um agente único é avaliado como ensemble de 1 membro, com a mesma extração
+de quantis (e funciona também com os módulos quantizados em int8).
+"""
+
+import json
+
+import d3rlpy
+import torch
+
+
+def _camadas_mlp(modulos):
+    """Achata Sequential/Linear/ReLU em uma lista de camadas suportadas."""
+    camadas = []
+    for modulo in modulos:
+        if isinstance(modulo, torch.nn.Sequential):
+            camadas.extend(_camadas_mlp(modulo))
+        elif isinstance(modulo, (torch.nn.Linear, torch.nn.ReLU)):
+            camadas.append(modulo)
+        else:
+            raise ValueError(f"Camada não suportada no ensemble: {type(modulo).__name__}")
+    return camadas
+
+
+def _empilhar(redes):
+    """Empilha N MLPs de mesma arquitetura em pesos (N, out, in) e vieses (N, 1, out)."""
+    camadas = [_camadas_mlp(rede) for rede in redes]
+    empilhadas = []
+    for nivel in zip(*camadas):
+        if isinstance(nivel[0], torch.nn.Linear):
+            pesos = torch.stack([c.weight.detach() for c in nivel]).transpose(1, 2).contiguous()
+            vieses = torch.stack([c.bias.detach() for c in nivel]).unsqueeze(1)
+            empilhadas.append((pesos, vieses))
+        else:
+            empilhadas.append(None)  # ReLU
+    return empilhadas
+
+
+def _forward(empilhadas, h):
+    for camada in empilhadas:
+        if camada is None:
+            h = torch.relu(h)
+        else:
+            pesos, vieses = camada
+            h = torch.baddbmm(vieses, h, pesos)
+    return h
+
+
+class EnsembleCQL:
+    """Avalia N agentes CQL (mesma arquitetura) como um único modelo em lote."""
+
+    def __init__(self, learnables):
+        self.n_membros = len(learnables)
+        self._modulos = None
+        if self.n_membros == 1:
+            # Membro único: forward pelos próprios módulos do d3rlpy (fp32 ou int8)
+            self._modulos = learnables[0].impl.modules
+            self.n_criticos = len(self._modulos.q_funcs)
+            return
+
+        politicas = [cql.impl.modules.policy for cql in learnables]
+        self._ator = _empilhar([[p._encoder._layers, p._mu] for p in politicas])
+
+        criticos = [q for cql in learnables for q in cql.impl.modules.q_funcs]
+        self.n_criticos = len(criticos) // self.n_membros
+        self._critico = _empilhar([[q._encoder._layers, q._fc] for q in criticos])
+
+    @classmethod
+    def carregar(cls, caminho_manifesto):
+        """Carrega os membros listados no manifesto JSON gerado pelo treino_ensemble.py."""
+        with open(caminho_manifesto, 'r') as f:
+            manifesto = json.load(f)
+        return cls([d3rlpy.load_learnable(m, device="cpu") for m in manifesto["membros"]])
+
+    @torch.no_grad()
+    def avaliar(self, state_matrix):
+        """Ação média do ensemble e quantis de todos os membros nessa ação.
+
+        Retorna `(acoes (B, 1), acoes_membros (M, B, 1), quantis (M, B, K))`, com
+        os quantis de cada membro já promediados sobre seus críticos.
+        """
+        x = torch.as_tensor(state_matrix, dtype=torch.float32)
+        n = x.shape[0]
+
+        if self._modulos is not None:
+            acoes = self._modulos.policy(x).squashed_mu
+            quantis = torch.stack([q_func(x, acoes).quantiles for q_func in self._modulos.q_funcs]).mean(dim=0)
+            return acoes.numpy(), acoes.unsqueeze(0).numpy(), quantis.unsqueeze(0).numpy()
+
+        acoes_membros = torch.tanh(_forward(self._ator, x.expand(self.n_membros, n, -1)))
+        acoes = acoes_membros.mean(dim=0)
+
+        entrada = torch.cat([x, acoes], dim=1)
+        quantis = _forward(self._critico, entrada.expand(self.n_membros * self.n_criticos, n, -1))
+        quantis = quantis.view(self.n_membros, self.n_criticos, n, -1).mean(dim=1)
+        return acoes.numpy(), acoes_membros.numpy(), quantis.numpy()
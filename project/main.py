@@ -1,4 +1,5 @@
 import os
+import io
 import time
 import json
 import joblib
@@ -8,10 +9,15 @@ import pandas as pd
 import uvicorn
 import subprocess
 import sys
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, Any, List
+from pydantic import BaseModel, Field, model_validator
+from typing import Dict, Any, List, Optional
+import quantizacao
+from artefatos import validar_ensemble
+from ensemble import EnsembleCQL
+from feature_store import FeatureStore, CAMPOS_MEMORIA, CAMPOS_SEGMENTO
 
 # --- 1. Inicialização do App FastAPI (ISSO DEVE VIR PRIMEIRO) ---
 app = FastAPI(title="LOCAC API de Precificação")
@@ -28,6 +34,25 @@ app.add_middleware(
 # --- 2. Definição do Estado Global ---
 models_state: Dict[str, Any] = {}
 
+# Modo de inferência opcional: "int8" ativa a quantização dinâmica dos agentes CQL
+MODOS_QUANTIZACAO = ("fp32", "int8")
+MODO_QUANTIZACAO = os.environ.get("LOCAC_QUANTIZACAO", "").lower() or "fp32"
+if MODO_QUANTIZACAO not in MODOS_QUANTIZACAO:
+    print(f"⚠️  LOCAC_QUANTIZACAO={MODO_QUANTIZACAO!r} não suportado {MODOS_QUANTIZACAO}; usando fp32.")
+    MODO_QUANTIZACAO = "fp32"
+N_ESTADOS_REFERENCIA = 512
+# Tamanho de lote típico do /bulk_recommend, usado para medir a latência do int8
+N_LOTE_BULK = 1024
+
+# Agente CQL de cada tipo de produto: (modelo, scaler da ação, scaler da recompensa)
+AGENTES_CQL = {
+    "venda_unica": ("cql_venda_unica", "scaler_acao", "scaler_recompensa"),
+    "assinatura": ("cql_assinatura", "scaler_assinatura_acao", "scaler_assinatura_recompensa"),
+}
+
+# Memória de assinatura por segmento (janelas 30/90d), persistida em snapshots
+feature_store = FeatureStore()
+
 # --- 3. Modelos de Entrada (Pydantic) ---
 class CampaignInput(BaseModel):
     Regiao: str
@@ -37,11 +62,20 @@ class CampaignInput(BaseModel):
     Idade: str
     Genero: str
     Conteudo: str
-    # Features de Assinatura opcionais
-    dias_desde_ultima_interacao: float = 0.0
-    clv_estimate_percentile: float = 0.0
-    avg_price_offered_segment_90d: float = 0.0
-    price_volatility_30d: float = 0.0
+    # Features de Assinatura opcionais (se omitidas, vêm do feature store)
+    dias_desde_ultima_interacao: Optional[float] = None
+    clv_estimate_percentile: Optional[float] = None
+    avg_price_offered_segment_90d: Optional[float] = None
+    price_volatility_30d: Optional[float] = None
+
+class InteractionInput(BaseModel):
+    Regiao: str
+    Plataforma: str
+    Tier: str
+    Idade: str
+    Genero: str
+    Conteudo: str
+    valor: float = 0.0
 
 class PredictionResponse(BaseModel):
     modelo: str
@@ -49,17 +83,29 @@ class PredictionResponse(BaseModel):
     lucro_estimado_sl: float
     var_5_percent: float
     cvar_5_percent: float
+    # Desvio entre membros do ensemble multi-seed (None com modelo único)
+    desvio_epistemico_preco: Optional[float] = None
+    desvio_epistemico_valor: Optional[float] = None
     latencia_ms: float
     kbs_applied: bool = False
     llm_explanation: str = "Explicação do LLM ainda não implementada."
 
 class MarketConfig(BaseModel):
-    lowMin: float
-    lowMax: float
-    highMin: float
-    highMax: float
-    budgetMin: float
-    budgetMax: float
+    lowMin: float = Field(gt=0)
+    lowMax: float = Field(gt=0)
+    highMin: float = Field(gt=0)
+    highMax: float = Field(gt=0)
+    budgetMin: float = Field(gt=0)
+    budgetMax: float = Field(gt=0)
+
+    @model_validator(mode="after")
+    def validar_faixas(self):
+        for nome, minimo, maximo in (("low", self.lowMin, self.lowMax),
+                                     ("high", self.highMin, self.highMax),
+                                     ("budget", self.budgetMin, self.budgetMax)):
+            if minimo >= maximo:
+                raise ValueError(f"{nome}Min deve ser menor que {nome}Max")
+        return self
 
 # --- 4. Funcionalidades de Re-treino (Dinâmico) ---
 
@@ -119,11 +165,17 @@ async def load_models():
         "scaler_acao": "scaler_acao.joblib",
         "scaler_recompensa": "scaler_recompensa.joblib",
         "scaler_assinatura_memoria": "scaler_assinatura_memoria.joblib",
+        "scaler_assinatura_acao": "scaler_assinatura_acao.joblib",
         "scaler_assinatura_recompensa": "scaler_assinatura_recompensa.joblib",
         "colunas_estado_base": "colunas_estado_base.json",
         "colunas_estado_assinatura": "colunas_estado_assinatura.json",
+        "ensemble_venda_unica": "ensemble_venda_unica.json",
+        "ensemble_assinatura": "ensemble_assinatura.json",
     }
     
+    if feature_store.carregar():
+        print(f"📦 Feature store restaurado: {len(feature_store.segmentos)} segmentos.")
+
     print("Carregando artefatos de IA...")
     try:
         # Carrega metadados
@@ -138,6 +190,7 @@ async def load_models():
         models_state["scaler_acao"] = joblib.load(artifact_paths["scaler_acao"])
         models_state["scaler_recompensa"] = joblib.load(artifact_paths["scaler_recompensa"])
         models_state["scaler_assinatura_memoria"] = joblib.load(artifact_paths["scaler_assinatura_memoria"])
+        models_state["scaler_assinatura_acao"] = joblib.load(artifact_paths["scaler_assinatura_acao"])
         models_state["scaler_assinatura_recompensa"] = joblib.load(artifact_paths["scaler_assinatura_recompensa"])
 
         # Carrega Modelos
@@ -147,6 +200,20 @@ async def load_models():
 
         print("✅ SUCESSO: Todos os modelos carregados.")
 
+        # Ensembles multi-seed (opcionais, gerados pelo treino_ensemble.py)
+        for chave in ("ensemble_venda_unica", "ensemble_assinatura"):
+            if not os.path.exists(artifact_paths[chave]):
+                continue
+            problemas = validar_ensemble(artifact_paths[chave])
+            if problemas:
+                print(f"⚠️  {chave} ignorado (obsoleto): {problemas}")
+                continue
+            models_state[chave] = EnsembleCQL.carregar(artifact_paths[chave])
+            print(f"🧬 {chave}: {models_state[chave].n_membros} membros carregados.")
+
+        if MODO_QUANTIZACAO == "int8":
+            aplicar_quantizacao(artifact_paths)
+
     except FileNotFoundError as e:
         print(f"❌ ERRO FATAL: Arquivo não encontrado: {e.filename}")
         # Não damos raise aqui para permitir que o servidor suba e receba a config inicial
@@ -154,8 +221,13 @@ async def load_models():
     except Exception as e:
         print(f"❌ ERRO FATAL inesperado: {e}")
 
+@app.on_event("shutdown")
+async def save_feature_store():
+    feature_store.salvar()
+
 # --- 6. Função de Pré-processamento ---
-def preprocess_input(input_data: CampaignInput, feature_type: str) -> np.ndarray:
+def preprocess_dataframe(df: pd.DataFrame, feature_type: str) -> np.ndarray:
+    """Transforma um DataFrame de estados brutos na matriz de estados dos agentes."""
     if "ohe" not in models_state:
         raise ValueError("Modelos não carregados. Configure o mercado primeiro.")
 
@@ -167,12 +239,14 @@ def preprocess_input(input_data: CampaignInput, feature_type: str) -> np.ndarray
         scaler_memoria = models_state["scaler_assinatura_memoria"]
         colunas_estado = models_state["colunas_estado_assinatura"]
 
-    input_dict = input_data.model_dump()
-    df = pd.DataFrame([input_dict])
+    df = df.reset_index(drop=True)
 
     # Transformações
     categorical_cols = ohe.feature_names_in_
-    df_categ = pd.DataFrame(ohe.transform(df[categorical_cols]).toarray(), columns=ohe.get_feature_names_out())
+    categ = ohe.transform(df[categorical_cols])
+    if hasattr(categ, "toarray"):  # OHE salvo com saída esparsa
+        categ = categ.toarray()
+    df_categ = pd.DataFrame(categ, columns=ohe.get_feature_names_out())
     
     numeric_cols_base = scaler_estado.feature_names_in_
     df_numeric_base = pd.DataFrame(scaler_estado.transform(df[numeric_cols_base]), columns=numeric_cols_base)
@@ -187,6 +261,233 @@ def preprocess_input(input_data: CampaignInput, feature_type: str) -> np.ndarray
     df_final_state = df_processed.reindex(columns=colunas_estado, fill_value=0)
     return df_final_state.to_numpy().astype(np.float32)
 
+def preprocess_input(input_data: CampaignInput, feature_type: str) -> np.ndarray:
+    return preprocess_dataframe(pd.DataFrame([input_data.model_dump()]), feature_type)
+
+def completar_memoria(input_data: CampaignInput) -> CampaignInput:
+    """Preenche as features de memória ausentes com os valores do feature store (ou 0.0)."""
+    faltantes = [c for c in CAMPOS_MEMORIA if getattr(input_data, c) is None]
+    if not faltantes:
+        return input_data
+    memoria = feature_store.features(FeatureStore.chave_segmento(input_data.model_dump())) or {}
+    return input_data.model_copy(update={c: memoria.get(c, 0.0) for c in faltantes})
+
+def avaliar_politica(cql, scaler_acao, scaler_recompensa, state_matrix: np.ndarray):
+    """Preço recomendado, VaR 5% e CVaR 5% (valores reais) de um agente único."""
+    return avaliar_ensemble(EnsembleCQL([cql]), scaler_acao, scaler_recompensa, state_matrix)[:3]
+
+def calcular_risco(quantis_norm: np.ndarray, scaler_recompensa):
+    """VaR 5% e CVaR 5% por linha a partir de quantis normalizados (B, K)."""
+    quantis_reais = scaler_recompensa.inverse_transform(quantis_norm.reshape(-1, 1)).reshape(quantis_norm.shape)
+
+    var_5 = np.percentile(quantis_reais, 5, axis=1)
+    cauda = quantis_reais <= var_5[:, None]
+    cvar_5 = (quantis_reais * cauda).sum(axis=1) / cauda.sum(axis=1)
+    return var_5, cvar_5
+
+def avaliar_ensemble(ensemble: EnsembleCQL, scaler_acao, scaler_recompensa, state_matrix: np.ndarray):
+    """Preço, VaR 5%, CVaR 5% e desvio epistêmico (preço, valor) entre os membros.
+
+    O risco vem da mistura dos quantis de todos os membros; com um único membro
+    são os quantis do próprio agente e os desvios são None.
+    """
+    acoes, acoes_membros, quantis = ensemble.avaliar(state_matrix)
+    precos = scaler_acao.inverse_transform(acoes)[:, 0]
+
+    # Risco sobre a mistura dos quantis de todos os membros: (B, M * K)
+    n = len(state_matrix)
+    var_5, cvar_5 = calcular_risco(quantis.transpose(1, 0, 2).reshape(n, -1), scaler_recompensa)
+    if ensemble.n_membros == 1:
+        return precos, var_5, cvar_5, None, None
+
+    precos_membros = scaler_acao.inverse_transform(acoes_membros.reshape(-1, 1)).reshape(ensemble.n_membros, n)
+    valores_membros = scaler_recompensa.inverse_transform(quantis.mean(axis=2).reshape(-1, 1)).reshape(ensemble.n_membros, n)
+    return precos, var_5, cvar_5, precos_membros.std(axis=0), valores_membros.std(axis=0)
+
+def recomendar(feature_type: str, state_vector: np.ndarray):
+    """Usa o ensemble multi-seed quando disponível; senão, o agente único."""
+    chave_modelo, chave_acao, chave_recompensa = AGENTES_CQL[feature_type]
+    scalers = (models_state[chave_acao], models_state[chave_recompensa])
+
+    ensemble = models_state.get(f"ensemble_{feature_type}") or EnsembleCQL([models_state[chave_modelo]])
+    return avaliar_ensemble(ensemble, *scalers, state_vector)
+
+# --- 6.1 Pré-processamento Colunar (Bulk) ---
+def layout_colunar(feature_type: str) -> Dict[str, Any]:
+    """Posição de cada categoria/feature numérica na matriz de estados (cacheado)."""
+    chave = f"layout_colunar_{feature_type}"
+    if chave in models_state:
+        return models_state[chave]
+
+    ohe = models_state["ohe"]
+    colunas_estado = models_state["colunas_estado_base"]
+    scalers = [models_state["scaler_estado"]]
+    if feature_type == "assinatura":
+        colunas_estado = models_state["colunas_estado_assinatura"]
+        scalers.append(models_state["scaler_assinatura_memoria"])
+    posicao = {nome: i for i, nome in enumerate(colunas_estado)}
+
+    # Nomes do OHE em blocos por coluna, na mesma ordem de ohe.categories_
+    nomes_ohe = list(ohe.get_feature_names_out())
+    categoricas, inicio = {}, 0
+    for col, cats in zip(ohe.feature_names_in_, ohe.categories_):
+        bloco = nomes_ohe[inicio:inicio + len(cats)]
+        inicio += len(cats)
+        categoricas[col] = np.array([posicao.get(nome, -1) for nome in bloco], dtype=np.int64)
+
+    numericas = {}
+    for scaler in scalers:
+        for col, media, escala in zip(scaler.feature_names_in_, scaler.mean_, scaler.scale_):
+            numericas[col] = (posicao.get(col, -1), media, escala)
+
+    models_state[chave] = {"n_colunas": len(colunas_estado), "categoricas": categoricas, "numericas": numericas}
+    return models_state[chave]
+
+def preprocess_columnar(colunas: Dict[str, np.ndarray], feature_type: str) -> np.ndarray:
+    """Monta a matriz de estados direto de códigos categóricos e colunas numéricas.
+
+    Equivalente ao OHE + StandardScaler de preprocess_dataframe, sem passar por pandas.
+    Códigos categóricos são índices em `ohe.categories_`. Para assinatura, colunas
+    de memória ausentes vêm do feature store por segmento (0.0 se o segmento nunca
+    foi visto), como no /recommend_subscription_price.
+    """
+    if "ohe" not in models_state:
+        raise ValueError("Modelos não carregados. Configure o mercado primeiro.")
+    layout = layout_colunar(feature_type)
+
+    obrigatorias = list(layout["categoricas"]) + list(models_state["scaler_estado"].feature_names_in_)
+    faltantes = [c for c in obrigatorias if c not in colunas]
+    if faltantes:
+        raise HTTPException(status_code=422, detail=f"Colunas ausentes: {faltantes}")
+    colunas = {c: np.asarray(v) for c, v in colunas.items()}
+    nao_vetores = [c for c, v in colunas.items() if v.ndim != 1]
+    if nao_vetores:
+        raise HTTPException(status_code=422, detail=f"Colunas devem ser arrays 1-D: {nao_vetores}")
+    n = len(colunas[next(iter(layout["categoricas"]))])
+    if n == 0:
+        raise HTTPException(status_code=422, detail="O lote não tem linhas.")
+
+    nao_numericas = [c for c in layout["numericas"] if c in colunas and not np.issubdtype(colunas[c].dtype, np.number)]
+    if nao_numericas:
+        raise HTTPException(status_code=422, detail=f"Colunas numéricas com tipo inválido: {nao_numericas}")
+    nao_finitas = [c for c in layout["numericas"] if c in colunas and not np.isfinite(colunas[c]).all()]
+    if nao_finitas:
+        raise HTTPException(status_code=422, detail=f"Colunas numéricas com NaN/inf: {nao_finitas}")
+
+    if any(len(colunas[c]) != n for c in colunas):
+        raise HTTPException(status_code=422, detail="Todas as colunas devem ter o mesmo comprimento.")
+
+    estados = np.zeros((n, layout["n_colunas"]), dtype=np.float32)
+    linhas = np.arange(n)
+
+    invalidos = {}
+    for col, posicoes in layout["categoricas"].items():
+        codigos = colunas[col]
+        if not np.issubdtype(codigos.dtype, np.integer):
+            raise HTTPException(status_code=422, detail=f"Coluna '{col}' deve conter códigos inteiros.")
+        fora = (codigos < 0) | (codigos >= len(posicoes))
+        if fora.any():
+            invalidos[col] = int(fora.sum())
+            continue
+        destino = posicoes[codigos]
+        validos = destino >= 0
+        estados[linhas[validos], destino[validos]] = 1.0
+    if invalidos:
+        raise HTTPException(status_code=422, detail=f"Códigos fora do vocabulário do OHE (linhas por coluna): {invalidos}")
+
+    if feature_type == "assinatura":
+        colunas = {**colunas, **memoria_colunar(colunas, [c for c in CAMPOS_MEMORIA if c not in colunas])}
+
+    for col, (posicao, media, escala) in layout["numericas"].items():
+        if posicao < 0:
+            continue
+        valores = colunas[col].astype(np.float64) if col in colunas else np.zeros(n)
+        estados[:, posicao] = (valores - media) / escala
+    return estados
+
+def memoria_colunar(colunas: Dict[str, np.ndarray], faltantes: List[str]) -> Dict[str, np.ndarray]:
+    """Features de memória do feature store para cada linha, consultadas uma vez por segmento."""
+    if not faltantes:
+        return {}
+    ohe = models_state["ohe"]
+    categorias = dict(zip(ohe.feature_names_in_, ohe.categories_))
+    codigos = np.stack([np.asarray(colunas[c]) for c in CAMPOS_SEGMENTO], axis=1)
+    unicos, inverso = np.unique(codigos, axis=0, return_inverse=True)
+
+    valores = np.zeros((len(unicos), len(faltantes)))
+    for i, linha in enumerate(unicos):
+        chave = FeatureStore.chave_segmento({c: categorias[c][k] for c, k in zip(CAMPOS_SEGMENTO, linha)})
+        memoria = feature_store.features(chave) or {}
+        valores[i] = [memoria.get(c, 0.0) for c in faltantes]
+    inverso = inverso.reshape(-1)
+    return {c: valores[inverso, j] for j, c in enumerate(faltantes)}
+
+# --- 6.2 Quantização (Modo de Inferência Opcional) ---
+def gerar_estados_referencia(feature_type: str, n: int = N_ESTADOS_REFERENCIA, seed: int = 42) -> np.ndarray:
+    """Amostra estados plausíveis a partir do vocabulário do OHE e das estatísticas dos scalers."""
+    rng = np.random.default_rng(seed)
+    ohe = models_state["ohe"]
+    scalers = [models_state["scaler_estado"]]
+    if feature_type == "assinatura":
+        scalers.append(models_state["scaler_assinatura_memoria"])
+
+    colunas = {col: rng.integers(len(cats), size=n) for col, cats in zip(ohe.feature_names_in_, ohe.categories_)}
+    for scaler in scalers:
+        for col, media, escala in zip(scaler.feature_names_in_, scaler.mean_, scaler.scale_):
+            colunas[col] = np.maximum(0.0, media + escala * rng.standard_normal(n))
+    return preprocess_columnar(colunas, feature_type)
+
+def aplicar_quantizacao(artifact_paths: Dict[str, str]):
+    """Substitui os agentes CQL por versões int8 quando valem a pena frente ao fp32.
+
+    O int8 só é ativado se o erro (relativo à escala dos scalers) ficar abaixo
+    do limiar e se não for mais lento nem por requisição (lote 1) nem no lote
+    do bulk. Tipos servidos por um ensemble multi-seed ficam em fp32 (o forward
+    empilhado não tem versão int8) e o relatório registra isso.
+    """
+    models_state["relatorio_quantizacao"] = {}
+    for feature_type, (nome, chave_acao, chave_recompensa) in AGENTES_CQL.items():
+        ensemble = models_state.get(f"ensemble_{feature_type}")
+        if ensemble is not None:
+            models_state["relatorio_quantizacao"][nome] = {
+                "aprovado": False,
+                "servido_por": f"ensemble_fp32 ({ensemble.n_membros} membros)",
+            }
+            print(f"ℹ️  {nome}: servido pelo ensemble fp32, quantização não se aplica.")
+            continue
+
+        estados = gerar_estados_referencia(feature_type)
+        scaler_acao, scaler_recompensa = models_state[chave_acao], models_state[chave_recompensa]
+        cql_fp32 = models_state[nome]
+        cql_int8 = quantizacao.carregar_quantizado(artifact_paths[nome])
+
+        relatorio = quantizacao.relatorio_calibracao(
+            avaliar_politica(cql_fp32, scaler_acao, scaler_recompensa, estados),
+            avaliar_politica(cql_int8, scaler_acao, scaler_recompensa, estados),
+            escalas=(scaler_acao.scale_[0], scaler_recompensa.scale_[0], scaler_recompensa.scale_[0]),
+            limiar=quantizacao.LIMIAR_ERRO_RELATIVO,
+        )
+        fp32, int8 = EnsembleCQL([cql_fp32]), EnsembleCQL([cql_int8])
+        relatorio.update(quantizacao.relatorio_desempenho(
+            fp32.avaliar, int8.avaliar,
+            {1: estados[:1], N_LOTE_BULK: gerar_estados_referencia(feature_type, n=N_LOTE_BULK, seed=43)},
+        ))
+        relatorio["memoria_bytes"] = {
+            "fp32": quantizacao.tamanho_modulos_bytes(cql_fp32),
+            "int8": quantizacao.tamanho_modulos_bytes(cql_int8),
+        }
+        relatorio["aprovado"] = relatorio["preciso"] and relatorio["mais_rapido"]
+        relatorio["servido_por"] = "int8" if relatorio["aprovado"] else "fp32"
+        models_state["relatorio_quantizacao"][nome] = relatorio
+
+        if relatorio["aprovado"]:
+            models_state[nome] = cql_int8
+            print(f"⚡ {nome}: quantização int8 ativada (erro máx. preço {relatorio['preco']['erro_relativo_max']:.4f}).")
+        elif not relatorio["preciso"]:
+            print(f"⚠️  {nome}: quantização recusada, erro acima do limiar. Mantendo fp32.")
+        else:
+            print(f"⚠️  {nome}: quantização recusada, int8 mais lento que o fp32. Mantendo fp32.")
+
 # --- 7. Endpoints de Inferência ---
 
 @app.post("/recommend_price", response_model=PredictionResponse)
@@ -195,16 +496,9 @@ async def recommend_price(input_data: CampaignInput):
     try:
         state_vector = preprocess_input(input_data, feature_type="venda_unica")
         
-        # RL Prediction
-        action_norm = models_state["cql_venda_unica"].predict(state_vector)[0]
-        preco_real = models_state["scaler_acao"].inverse_transform(action_norm.reshape(1, -1))[0][0]
-        
-        # Risco
-        quantis_norm = models_state["cql_venda_unica"].predict_value(state_vector, action_norm.reshape(1, -1))[0]
-        quantis_reais = models_state["scaler_recompensa"].inverse_transform(quantis_norm.reshape(1, -1)).flatten()
-        
-        var_5 = np.percentile(quantis_reais, 5)
-        cvar_5 = quantis_reais[quantis_reais <= var_5].mean()
+        # RL Prediction + Risco
+        precos, vars_5, cvars_5, desvio_preco, desvio_valor = recomendar("venda_unica", state_vector)
+        preco_real, var_5, cvar_5 = precos[0], vars_5[0], cvars_5[0]
 
         # SL Prediction
         lucro_sl = models_state["sl_profit"].predict(state_vector)[0]
@@ -215,6 +509,8 @@ async def recommend_price(input_data: CampaignInput):
             lucro_estimado_sl=float(lucro_sl),
             var_5_percent=float(var_5),
             cvar_5_percent=float(cvar_5),
+            desvio_epistemico_preco=None if desvio_preco is None else float(desvio_preco[0]),
+            desvio_epistemico_valor=None if desvio_valor is None else float(desvio_valor[0]),
             latencia_ms=(time.time() - start_time) * 1000
         )
     except Exception as e:
@@ -222,34 +518,109 @@ async def recommend_price(input_data: CampaignInput):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/recommend_subscription_price", response_model=PredictionResponse)
-async def recommend_subscription_price(input_data: CampaignInput):
+async def recommend_subscription_price(input_data: CampaignInput, background_tasks: BackgroundTasks):
     start_time = time.time()
     try:
+        input_data = completar_memoria(input_data)
         state_vector = preprocess_input(input_data, feature_type="assinatura")
         
-        action_norm = models_state["cql_assinatura"].predict(state_vector)[0]
-        preco_real = models_state["scaler_assinatura_recompensa"].inverse_transform(action_norm.reshape(1, -1))[0][0]
-        
-        quantis_norm = models_state["cql_assinatura"].predict_value(state_vector, action_norm.reshape(1, -1))[0]
-        quantis_reais = models_state["scaler_assinatura_recompensa"].inverse_transform(quantis_norm.reshape(1, -1)).flatten()
-        
-        var_5 = np.percentile(quantis_reais, 5)
-        cvar_5 = quantis_reais[quantis_reais <= var_5].mean()
+        precos, vars_5, cvars_5, desvio_preco, desvio_valor = recomendar("assinatura", state_vector)
+        preco_real, var_5, cvar_5 = precos[0], vars_5[0], cvars_5[0]
         
         lucro_sl = models_state["sl_profit"].predict(state_vector)[0]
 
+        feature_store.registrar_preco(FeatureStore.chave_segmento(input_data.model_dump()), float(preco_real))
+        background_tasks.add_task(feature_store.snapshot_se_necessario)
+
         return PredictionResponse(
             modelo="RL (Assinatura) LTV",
             preco_recomendado=float(preco_real),
             lucro_estimado_sl=float(lucro_sl),
             var_5_percent=float(var_5),
             cvar_5_percent=float(cvar_5),
+            desvio_epistemico_preco=None if desvio_preco is None else float(desvio_preco[0]),
+            desvio_epistemico_valor=None if desvio_valor is None else float(desvio_valor[0]),
             latencia_ms=(time.time() - start_time) * 1000
         )
     except Exception as e:
         print(f"Erro: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/bulk_schema")
+def bulk_schema():
+    """Vocabulário dos códigos categóricos aceitos pelo /bulk_recommend."""
+    if "ohe" not in models_state:
+        raise HTTPException(status_code=503, detail="Modelos não carregados.")
+    ohe = models_state["ohe"]
+    return {
+        "categoricas": {col: [str(c) for c in cats] for col, cats in zip(ohe.feature_names_in_, ohe.categories_)},
+        "numericas": {
+            "venda_unica": list(models_state["scaler_estado"].feature_names_in_),
+            "assinatura": list(models_state["scaler_estado"].feature_names_in_)
+                          + list(models_state["scaler_assinatura_memoria"].feature_names_in_),
+        },
+    }
+
+def pontuar_lote(colunas: Dict[str, np.ndarray], tipo: str) -> bytes:
+    """Pré-processa, pontua e serializa o lote em .npz (roda no threadpool, fora do event loop)."""
+    try:
+        state_matrix = preprocess_columnar(colunas, tipo)
+        precos, vars_5, cvars_5, desvio_preco, desvio_valor = recomendar(tipo, state_matrix)
+        resultado = {
+            "preco_recomendado": precos.astype(np.float32),
+            "lucro_estimado_sl": np.asarray(models_state["sl_profit"].predict(state_matrix), dtype=np.float32),
+            "var_5_percent": vars_5.astype(np.float32),
+            "cvar_5_percent": cvars_5.astype(np.float32),
+        }
+        if desvio_preco is not None:
+            resultado["desvio_epistemico_preco"] = desvio_preco.astype(np.float32)
+            resultado["desvio_epistemico_valor"] = desvio_valor.astype(np.float32)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Erro: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **resultado)
+    return buffer.getvalue()
+
+@app.post("/bulk_recommend")
+async def bulk_recommend(request: Request, tipo: str = "venda_unica"):
+    """Recomendação em lote com payload colunar NumPy (.npz) na entrada e na saída.
+
+    Cada array do .npz é uma coluna: códigos inteiros para as categóricas (ver
+    /bulk_schema) e floats para as numéricas. Em `tipo=assinatura` as colunas de
+    memória são opcionais (vêm do feature store); os preços do lote não são
+    registrados no feature store, ao contrário do /recommend_subscription_price.
+    """
+    start_time = time.time()
+    if tipo not in AGENTES_CQL:
+        raise HTTPException(status_code=422, detail=f"Tipo inválido: {tipo}")
+    try:
+        with np.load(io.BytesIO(await request.body()), allow_pickle=False) as payload:
+            colunas = {nome: payload[nome] for nome in payload.files}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Payload .npz inválido: {e}")
+
+    conteudo = await run_in_threadpool(pontuar_lote, colunas, tipo)
+    return Response(
+        content=conteudo,
+        media_type="application/octet-stream",
+        headers={"X-Latencia-Ms": f"{(time.time() - start_time) * 1000:.2f}"},
+    )
+
+@app.post("/record_interaction")
+async def record_interaction(interaction: InteractionInput, background_tasks: BackgroundTasks):
+    chave = FeatureStore.chave_segmento(interaction.model_dump())
+    feature_store.registrar_interacao(chave, interaction.valor)
+    background_tasks.add_task(feature_store.snapshot_se_necessario)
+    return {"status": "ok", "segmento": chave, "features": feature_store.features(chave)}
+
+@app.get("/quantization_report")
+def quantization_report():
+    return {"modo": MODO_QUANTIZACAO, "relatorio": models_state.get("relatorio_quantizacao", {})}
+
 @app.get("/")
 def read_root():
     return {"status": "LOCAC API Online", "models_loaded": "cql_venda_unica" in models_state}
\ No newline at end of file
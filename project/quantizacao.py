@@ -0,0 +1,119 @@
+"""
+Quantização Dinâmica (int8) dos Agentes CQL para Inferência em CPU
+Converte as camadas Linear do ator e do crítico de quantis para int8 e
+valida o modelo quantizado contra o fp32 (erro, latência e memória) antes
+de ativá-lo.
+"""
+
+import dataclasses
+import io
+import time
+
+import numpy as np
+import torch
+import d3rlpy
+
+# Erro máximo tolerado (preço, VaR e CVaR) frente ao fp32, relativo à escala
+# de cada grandeza (desvio-padrão do scaler usado no treino)
+LIMIAR_ERRO_RELATIVO = 0.02
+REPETICOES_LATENCIA = 50
+
+
+def quantizar_learnable(cql):
+    """Aplica quantização dinâmica int8 (in-place) nas redes usadas na inferência.
+
+    No ator só o encoder e a média (`_mu`) são quantizados: o d3rlpy exige que
+    `_logstd` continue um `nn.Linear`. Os críticos (q_funcs) são quantizados por
+    inteiro. Redes-alvo e otimizadores só servem ao treino e são descartados,
+    para que o modelo servido ocupe de fato menos memória.
+    """
+    impl = cql.impl
+    modules = impl.modules
+    qconfig = torch.ao.quantization.default_dynamic_qconfig
+    torch.ao.quantization.quantize_dynamic(
+        modules.policy, {"_encoder": qconfig, "_mu": qconfig}, dtype=torch.qint8, inplace=True
+    )
+    for q_func in modules.q_funcs:
+        torch.ao.quantization.quantize_dynamic(
+            q_func, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+
+    so_treino = {
+        campo.name: None for campo in dataclasses.fields(modules)
+        if campo.name.startswith("targ_") or campo.name.endswith("_optim")
+    }
+    impl._modules = dataclasses.replace(modules, **so_treino)
+    impl._targ_q_func_forwarder = None
+    impl._checkpointer = None  # guarda referências a todos os módulos originais
+    return cql
+
+
+def carregar_quantizado(caminho):
+    """Carrega um learnable do disco e devolve sua versão quantizada (CPU)."""
+    cql = d3rlpy.load_learnable(caminho, device="cpu")
+    return quantizar_learnable(cql)
+
+
+def _erro_relativo(referencia, candidato, escala_minima):
+    # Escala fixa por grandeza: VaR/CVaR cruzam o zero, então dividir pelo
+    # próprio valor de referência explode o erro sem significado prático.
+    # Os quantis são retornos descontados, não recompensas: a dispersão do fp32
+    # pode passar bastante da escala do scaler, e vale a maior das duas.
+    escala = max(float(escala_minima), float(np.std(referencia)))
+    return np.abs(candidato - referencia) / escala
+
+
+def relatorio_calibracao(resultado_fp32, resultado_int8, escalas, limiar=LIMIAR_ERRO_RELATIVO):
+    """Compara as saídas (preço, VaR, CVaR) do modelo quantizado com as do fp32.
+
+    Ambos os resultados são tuplas `(precos, var_5, cvar_5)` de arrays avaliados
+    sobre o mesmo conjunto de estados de referência; `escalas` traz a escala mínima
+    de cada grandeza, ex.: `(scaler_acao.scale_[0], scaler_recompensa.scale_[0], ...)`.
+    """
+    relatorio = {"limiar_erro_relativo": limiar, "n_estados": int(len(resultado_fp32[0]))}
+    preciso = True
+    for nome, ref, cand, escala in zip(("preco", "var_5", "cvar_5"), resultado_fp32, resultado_int8, escalas):
+        erro = _erro_relativo(np.asarray(ref), np.asarray(cand), escala)
+        relatorio[nome] = {
+            "erro_relativo_medio": float(erro.mean()),
+            "erro_relativo_max": float(erro.max()),
+        }
+        preciso = preciso and bool(erro.max() <= limiar)
+    relatorio["preciso"] = preciso
+    return relatorio
+
+
+def medir_latencia_us(avaliar, estados, repeticoes=None):
+    """Mediana (µs) de `avaliar(estados)` após uma chamada de aquecimento."""
+    avaliar(estados)
+    tempos = []
+    for _ in range(repeticoes or REPETICOES_LATENCIA):
+        inicio = time.perf_counter()
+        avaliar(estados)
+        tempos.append(time.perf_counter() - inicio)
+    return float(np.median(tempos) * 1e6)
+
+
+def tamanho_modulos_bytes(cql):
+    """Bytes serializados das redes mantidas pelo learnable (pesos fp32 ou int8 empacotados)."""
+    modules = cql.impl.modules
+    tamanho = 0
+    for campo in dataclasses.fields(modules):
+        modulo = getattr(modules, campo.name)
+        if isinstance(modulo, torch.nn.Module):
+            buffer = io.BytesIO()
+            torch.save(modulo.state_dict(), buffer)
+            tamanho += buffer.tell()
+    return tamanho
+
+
+def relatorio_desempenho(avaliar_fp32, avaliar_int8, estados_por_lote):
+    """Latência de cada modelo por tamanho de lote; int8 só vale se não for mais lento em nenhum."""
+    latencias = {}
+    mais_rapido = True
+    for lote, estados in estados_por_lote.items():
+        fp32 = medir_latencia_us(avaliar_fp32, estados)
+        int8 = medir_latencia_us(avaliar_int8, estados)
+        latencias[f"lote_{lote}"] = {"fp32_us": fp32, "int8_us": int8}
+        mais_rapido = mais_rapido and int8 <= fp32
+    return {"latencia": latencias, "mais_rapido": mais_rapido}
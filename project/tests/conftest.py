@@ -0,0 +1,89 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Os módulos do projeto são planos (import quantizacao, import main...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+VOCABULARIO = {
+    'Regiao': ['North America', 'Europe', 'Asia', 'South America'],
+    'Plataforma': ['Instagram', 'Facebook', 'LinkedIn'],
+    'Tier': ['Low Ticket', 'High Ticket'],
+    'Idade': ['18-24', '25-34', '35-44'],
+    'Genero': ['Female', 'Male'],
+    'Conteudo': ['Video', 'Imagem'],
+    'Tipo_Produto': ['InfoProduto', 'SaaS'],
+    'Modelo_Cobranca': ['Venda Unica'],
+    'Complexidade_Oferta': ['Baixa', 'Media', 'Alta'],
+}
+
+
+def _ajustar_scaler(valores, colunas=None):
+    from sklearn.preprocessing import StandardScaler
+    dados = pd.DataFrame(valores, columns=colunas) if colunas else np.asarray(valores).reshape(-1, 1)
+    return StandardScaler().fit(dados)
+
+
+@pytest.fixture
+def criar_agente():
+    """Fábrica de agentes CQL (quantis, não treinados) salvos e recarregados do disco."""
+    import d3rlpy
+    from d3rlpy.algos import CQLConfig
+    from d3rlpy.models import QRQFunctionFactory
+
+    def criar(caminho, n_obs):
+        cql = CQLConfig(q_func_factory=QRQFunctionFactory(n_quantiles=64)).create(device="cpu")
+        cql.create_impl((n_obs,), 1)
+        cql.save(str(caminho))
+        return d3rlpy.load_learnable(str(caminho), device="cpu")
+    return criar
+
+
+@pytest.fixture
+def artefatos(tmp_path, criar_agente):
+    """Preenche main.models_state com OHE, scalers e agentes sintéticos; devolve os caminhos dos agentes."""
+    import main
+    from economia import categorical_features, numeric_features_base, numeric_features_memoria
+    from sklearn.preprocessing import OneHotEncoder
+
+    rng = np.random.default_rng(0)
+    ohe = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
+    ohe.fit(pd.DataFrame({c: np.resize(VOCABULARIO[c], 12) for c in categorical_features}))
+    colunas_base = list(ohe.get_feature_names_out()) + numeric_features_base
+    colunas_assinatura = colunas_base + numeric_features_memoria
+
+    estado_salvo = dict(main.models_state)
+    main.models_state.clear()
+    main.models_state.update({
+        "ohe": ohe,
+        "colunas_estado_base": colunas_base,
+        "colunas_estado_assinatura": colunas_assinatura,
+        "scaler_estado": _ajustar_scaler(rng.uniform(100, 20000, (200, 1)), numeric_features_base),
+        "scaler_assinatura_memoria": _ajustar_scaler(rng.uniform(0, 100, (200, 4)), numeric_features_memoria),
+        "scaler_acao": _ajustar_scaler(rng.uniform(10, 5000, 200)),
+        "scaler_recompensa": _ajustar_scaler(rng.uniform(0, 40000, 200)),
+        "scaler_assinatura_acao": _ajustar_scaler(rng.uniform(10, 5000, 200)),
+        "scaler_assinatura_recompensa": _ajustar_scaler(rng.uniform(0, 25000, 200)),
+    })
+
+    artifact_paths = {}
+    for feature_type, (nome, _, _) in main.AGENTES_CQL.items():
+        n_obs = len(colunas_assinatura if feature_type == "assinatura" else colunas_base)
+        artifact_paths[nome] = tmp_path / f"{nome}.d3"
+        main.models_state[nome] = criar_agente(artifact_paths[nome], n_obs)
+
+    yield artifact_paths
+    main.models_state.clear()
+    main.models_state.update(estado_salvo)
+
+
+@pytest.fixture
+def medicao_rapida(monkeypatch):
+    """Lote do bulk e repetições de latência reduzidos para a calibração int8."""
+    import main
+    import quantizacao
+    monkeypatch.setattr(main, "N_LOTE_BULK", 64)
+    monkeypatch.setattr(quantizacao, "REPETICOES_LATENCIA", 3)
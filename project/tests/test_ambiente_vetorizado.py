@@ -0,0 +1,36 @@
+import gymnasium as gym
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from ambiente_vetorizado import CampanhasVectorEnv
+from economia import CENARIOS_ARTIGO, REGIOES, PLATAFORMAS, categorical_features, numeric_features_base, montar_estado
+
+
+def _criar_ambiente(num_envs, horizonte):
+    df = pd.DataFrame([montar_estado(c, r, p) for c in CENARIOS_ARTIGO for r in REGIOES for p in PLATAFORMAS])
+    ohe = OneHotEncoder(sparse_output=False, handle_unknown='ignore').fit(df[categorical_features])
+    scaler_estado = StandardScaler().fit(df[numeric_features_base])
+    scaler_acao = StandardScaler().fit(np.array([[10.0], [25000.0]]))
+    return CampanhasVectorEnv(num_envs, ohe, scaler_estado, scaler_acao, horizonte=horizonte, seed=0)
+
+
+def test_contrato_vector_env_gymnasium():
+    env = _criar_ambiente(16, horizonte=2)
+    assert isinstance(env, gym.vector.VectorEnv)
+    assert env.num_envs == 16
+    assert env.observation_space.shape == (16,) + env.single_observation_space.shape
+    assert env.action_space.shape == (16, 1)
+    assert "autoreset_mode" in env.metadata
+
+    obs, _ = env.reset(seed=1)
+    assert env.observation_space.contains(obs)
+
+    _, recompensa, terminados, truncados, infos = env.step(env.action_space.sample())
+    assert recompensa.shape == (16,) and not truncados.any() and "final_obs" not in infos
+    obs, _, terminados, truncados, infos = env.step(env.action_space.sample())
+    assert truncados.all() and not terminados.any()
+    assert infos["_final_obs"].all()
+    assert env.observation_space.contains(infos["final_obs"])
+    assert not np.array_equal(infos["final_obs"], obs)  # o reset sorteia uma nova campanha
+    env.close()
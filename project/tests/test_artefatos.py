@@ -0,0 +1,72 @@
+import json
+
+from artefatos import (
+    escrever_manifesto,
+    hash_arquivo,
+    hash_config_mercado,
+    inicializar_manifesto,
+    registrar_no_manifesto,
+    validar_ensemble,
+    validar_manifesto,
+)
+
+ARTEFATOS = ["modelo.pt", "scaler.joblib"]
+
+
+def _treino_simulado(tmp_path):
+    (tmp_path / "config_market.json").write_text('{"tiers": []}')
+    for nome in ARTEFATOS:
+        (tmp_path / nome).write_bytes(nome.encode())
+    escrever_manifesto(ARTEFATOS, config_hash=hash_config_mercado())
+
+
+def test_ensemble_obsoleto_quando_buffer_muda(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "buffer.h5").write_bytes(b"buffer v1")
+    (tmp_path / "membro_seed42.pt").write_bytes(b"pesos")
+    with open("ensemble_venda_unica.json", "w") as f:
+        json.dump({"membros": ["membro_seed42.pt"], "buffer": "buffer.h5", "buffer_hash": hash_arquivo("buffer.h5")}, f)
+
+    assert validar_ensemble("ensemble_venda_unica.json") == ["artefatos_manifest.json (ausente)"]
+    registrar_no_manifesto(["ensemble_venda_unica.json", "membro_seed42.pt"])
+    assert validar_ensemble("ensemble_venda_unica.json") == []
+
+    (tmp_path / "buffer.h5").write_bytes(b"buffer v2")
+    assert validar_ensemble("ensemble_venda_unica.json") == ["buffer.h5 (buffer mudou desde o treino do ensemble)"]
+
+
+def test_manifesto_detecta_artefato_alterado(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _treino_simulado(tmp_path)
+    assert validar_manifesto(ARTEFATOS) == []
+
+    (tmp_path / "scaler.joblib").write_bytes(b"scaler de outro treino")
+    assert validar_manifesto(ARTEFATOS) == ["scaler.joblib (hash diverge do manifesto)"]
+
+    (tmp_path / "modelo.pt").unlink()
+    assert validar_manifesto(ARTEFATOS) == ["modelo.pt (ausente)"]
+
+
+def test_manifesto_detecta_config_de_mercado_alterado(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _treino_simulado(tmp_path)
+
+    (tmp_path / "config_market.json").write_text('{"tiers": ["Low Ticket"]}')
+    assert validar_manifesto(ARTEFATOS) == ["config_market.json (alterado desde o último treino)"]
+
+
+def test_manifesto_inicializado_sem_retreino(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "modelo.pt").write_bytes(b"pesos")
+    assert not inicializar_manifesto(ARTEFATOS)  # falta um artefato: precisa treinar
+    assert validar_manifesto(ARTEFATOS) == ["scaler.joblib (ausente)"]
+
+    (tmp_path / "scaler.joblib").write_bytes(b"scaler")
+    assert validar_manifesto(ARTEFATOS) == ["artefatos_manifest.json (ausente)"]
+    assert inicializar_manifesto(ARTEFATOS)
+    assert validar_manifesto(ARTEFATOS) == []
+
+    # Com o manifesto existente, nada é sobrescrito: alterações continuam detectadas
+    (tmp_path / "modelo.pt").write_bytes(b"pesos alterados")
+    assert not inicializar_manifesto(ARTEFATOS)
+    assert validar_manifesto(ARTEFATOS) == ["modelo.pt (hash diverge do manifesto)"]
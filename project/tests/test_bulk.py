@@ -0,0 +1,107 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+def _colunas_bulk(n):
+    ohe = main.models_state["ohe"]
+    colunas = {c: np.zeros(n, dtype=np.int64) for c in ohe.feature_names_in_}
+    colunas['Orcamento'] = np.full(n, 1000.0)
+    return colunas
+
+
+def _npz(colunas):
+    buffer = io.BytesIO()
+    np.savez(buffer, **colunas)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def cliente(artefatos):
+    """TestClient sem o contexto (não dispara o load_models do startup) com um regressor SL mínimo."""
+    from sklearn.dummy import DummyRegressor
+    main.models_state["sl_profit"] = DummyRegressor(constant=500.0, strategy="constant").fit([[0.0]], [500.0])
+    return TestClient(main.app)
+
+
+def test_bulk_coluna_numerica_invalida_retorna_422(artefatos):
+    colunas = _colunas_bulk(4)
+    colunas['Orcamento'] = np.array(['a', 'b', 'c', 'd'])
+    with pytest.raises(main.HTTPException) as erro:
+        main.preprocess_columnar(colunas, "venda_unica")
+    assert erro.value.status_code == 422
+
+
+def test_bulk_assinatura_usa_feature_store(artefatos, monkeypatch, tmp_path):
+    store = main.FeatureStore(caminho_snapshot=str(tmp_path / "snap.json"))
+    monkeypatch.setattr(main, "feature_store", store)
+
+    ohe = main.models_state["ohe"]
+    campanha = {c: cats[0] for c, cats in zip(ohe.feature_names_in_, ohe.categories_)}
+    campanha['Orcamento'] = 1000.0
+    chave = main.FeatureStore.chave_segmento(campanha)
+    for preco in (100.0, 120.0, 140.0):
+        store.registrar_preco(chave, preco)
+    store.registrar_interacao(chave, 50.0)
+
+    individual = main.preprocess_dataframe(pd.DataFrame([{**campanha, **store.features(chave)}]), "assinatura")
+    colunas = _colunas_bulk(3)
+    colunas['Regiao'] = np.array([0, 1, 0])  # a linha 1 é um segmento nunca visto
+    lote = main.preprocess_columnar(colunas, "assinatura")
+
+    np.testing.assert_allclose(lote[0], individual[0], rtol=1e-5, atol=1e-4)
+    np.testing.assert_array_equal(lote[0], lote[2])
+    assert not np.allclose(lote[0], lote[1])
+
+
+def test_bulk_schema_alimenta_bulk_recommend(cliente):
+    schema = cliente.get("/bulk_schema").json()
+    ohe = main.models_state["ohe"]
+    assert schema["categoricas"] == {c: list(cats) for c, cats in zip(ohe.feature_names_in_, ohe.categories_)}
+    assert schema["numericas"]["venda_unica"] == ["Orcamento"]
+
+    # Monta o lote a partir do schema: códigos são índices nas listas de categorias
+    n = 5
+    colunas = {col: np.arange(n) % len(cats) for col, cats in schema["categoricas"].items()}
+    colunas.update({col: np.linspace(500.0, 5000.0, n) for col in schema["numericas"]["venda_unica"]})
+
+    resposta = cliente.post("/bulk_recommend?tipo=venda_unica", content=_npz(colunas))
+    assert resposta.status_code == 200
+    assert "X-Latencia-Ms" in resposta.headers
+    with np.load(io.BytesIO(resposta.content), allow_pickle=False) as saida:
+        assert set(saida.files) == {"preco_recomendado", "lucro_estimado_sl", "var_5_percent", "cvar_5_percent"}
+        for nome in saida.files:
+            assert saida[nome].shape == (n,) and saida[nome].dtype == np.float32
+
+        # Mesmo resultado do caminho de uma linha por vez
+        estados = main.preprocess_columnar(colunas, "venda_unica")
+        precos, var_5, _ = main.avaliar_politica(
+            main.models_state["cql_venda_unica"],
+            main.models_state["scaler_acao"], main.models_state["scaler_recompensa"], estados,
+        )
+        np.testing.assert_allclose(saida["preco_recomendado"], precos, rtol=1e-5)
+        np.testing.assert_allclose(saida["var_5_percent"], var_5, rtol=1e-5)
+
+
+@pytest.mark.parametrize("alterar", [
+    lambda c: c.update(Orcamento=np.full((4, 2), 1000.0)),                  # coluna 2-D
+    lambda c: c.update(Regiao=np.array(0)),                                 # array 0-d
+    lambda c: c.update({k: v[:0] for k, v in c.items()}),                   # zero linhas
+    lambda c: c.update(Orcamento=np.array([1000.0, np.nan, 1000.0, 1.0])),  # NaN
+    lambda c: c.update(Orcamento=np.array([1000.0, np.inf, 1000.0, 1.0])),  # inf
+    lambda c: c.update(Regiao=np.zeros(3, dtype=np.int64)),                 # comprimentos diferentes
+], ids=["2d", "0d", "vazio", "nan", "inf", "comprimento"])
+def test_bulk_payload_invalido_retorna_422(cliente, alterar):
+    colunas = _colunas_bulk(4)
+    alterar(colunas)
+    resposta = cliente.post("/bulk_recommend?tipo=venda_unica", content=_npz(colunas))
+    assert resposta.status_code == 422, resposta.text
+
+
+def test_bulk_payload_nao_npz_retorna_400(cliente):
+    assert cliente.post("/bulk_recommend", content=b"nao e npz").status_code == 400
@@ -0,0 +1,21 @@
+import pytest
+from pydantic import ValidationError
+
+from economia import N_FAIXAS_PRECO, N_NIVEIS_ORCAMENTO, cenarios_do_mercado
+from main import MarketConfig
+
+
+def test_cenarios_com_minimos_zero_usam_espacamento_linear():
+    config = {"price_ranges": {"Low Ticket": {"min": 0.0, "max": 90.0}}, "budget_range": {"min": 0.0, "max": 1000.0}}
+    cenarios = cenarios_do_mercado(config)
+    assert len(cenarios) == N_FAIXAS_PRECO * N_NIVEIS_ORCAMENTO
+    assert [c['Price_Min'] for c in cenarios[::N_NIVEIS_ORCAMENTO]] == [0.0, 30.0, 60.0]
+    assert [c['Budget'] for c in cenarios[:N_NIVEIS_ORCAMENTO]] == [0.0, 500.0, 1000.0]
+
+
+@pytest.mark.parametrize("campos", [{"lowMin": 0.0}, {"budgetMin": -1.0}, {"highMin": 6000.0}])
+def test_market_config_rejeita_faixas_invalidas(campos):
+    config = dict(lowMin=10, lowMax=100, highMin=500, highMax=5000, budgetMin=100, budgetMax=10000)
+    config.update(campos)
+    with pytest.raises(ValidationError):
+        MarketConfig(**config)
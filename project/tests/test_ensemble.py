@@ -0,0 +1,56 @@
+import numpy as np
+import torch
+
+import main
+from ensemble import EnsembleCQL
+
+
+def test_membro_unico_igual_ao_forward_empilhado(artefatos):
+    cql = main.models_state["cql_assinatura"]
+    estados = main.gerar_estados_referencia("assinatura", n=16)
+    acoes, _, quantis = EnsembleCQL([cql]).avaliar(estados)
+    acoes_emp, acoes_membros, quantis_emp = EnsembleCQL([cql, cql]).avaliar(estados)
+
+    np.testing.assert_allclose(acoes_emp, acoes, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(quantis_emp[0], quantis[0], rtol=1e-4, atol=1e-5)
+    assert acoes_membros.shape == (2, 16, 1)
+
+
+def test_membros_distintos_batem_com_predict_de_cada_um(artefatos, criar_agente, tmp_path):
+    n_obs = len(main.models_state["colunas_estado_base"])
+    membros = [criar_agente(tmp_path / f"membro_{i}.d3", n_obs) for i in range(3)]
+    estados = main.gerar_estados_referencia("venda_unica", n=32)
+    ensemble = EnsembleCQL(membros)
+
+    acoes, acoes_membros, quantis = ensemble.avaliar(estados)
+    for m, cql in enumerate(membros):
+        np.testing.assert_allclose(acoes_membros[m], cql.predict(estados), rtol=1e-5, atol=1e-6)
+        # Quantis do membro m na ação média do ensemble, direto pelos críticos do d3rlpy
+        x, a = torch.as_tensor(estados), torch.as_tensor(acoes)
+        with torch.no_grad():
+            quantis_m = torch.stack([q(x, a).quantiles for q in cql.impl.modules.q_funcs]).mean(dim=0)
+        np.testing.assert_allclose(quantis[m], quantis_m.numpy(), rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(acoes, acoes_membros.mean(axis=0), rtol=1e-6)
+
+    scalers = (main.models_state["scaler_acao"], main.models_state["scaler_recompensa"])
+    _, _, _, desvio_preco, desvio_valor = main.avaliar_ensemble(ensemble, *scalers, estados)
+    assert np.all(desvio_preco > 0) and np.all(desvio_valor > 0)
+
+
+def test_recomendar_usa_scalers_do_tipo(artefatos):
+    estados = main.gerar_estados_referencia("assinatura", n=16)
+    precos, var_5, cvar_5, desvio_preco, desvio_valor = main.recomendar("assinatura", estados)
+
+    acoes, _, _ = EnsembleCQL([main.models_state["cql_assinatura"]]).avaliar(estados)
+    esperado = main.models_state["scaler_assinatura_acao"].inverse_transform(acoes)[:, 0]
+    np.testing.assert_allclose(precos, esperado, rtol=1e-6)
+    assert desvio_preco is None and desvio_valor is None
+
+
+def test_relatorio_int8_nao_cobre_ensemble(artefatos, medicao_rapida):
+    main.models_state["ensemble_venda_unica"] = EnsembleCQL([main.models_state["cql_venda_unica"]] * 2)
+    main.aplicar_quantizacao(artefatos)
+    relatorio = main.models_state["relatorio_quantizacao"]
+    assert relatorio["cql_venda_unica"]["servido_por"].startswith("ensemble_fp32")
+    assert not relatorio["cql_venda_unica"]["aprovado"]
+    assert relatorio["cql_assinatura"]["servido_por"] in ("int8", "fp32")
@@ -0,0 +1,87 @@
+import json
+import random
+import threading
+
+from feature_store import FeatureStore, SEGUNDOS_POR_DIA
+
+T0 = 1_700_000_000.0
+
+
+def _percentil_ingenuo(store, chave, ts):
+    dia = int(ts // SEGUNDOS_POR_DIA)
+    valores = [s.valor_90d.total(dia) for s in store.segmentos.values()]
+    valor = store.segmentos[chave].valor_90d.total(dia)
+    return sum(v <= valor for v in valores) / len(valores)
+
+
+def test_percentil_incremental_igual_ao_ingenuo(tmp_path):
+    rng = random.Random(0)
+    store = FeatureStore(caminho_snapshot=str(tmp_path / "snap.json"))
+    chaves = [f"seg{i}" for i in range(50)]
+
+    ts = T0
+    for _ in range(2000):
+        ts += rng.uniform(0, 0.2 * SEGUNDOS_POR_DIA)  # atravessa a janela de 90d
+        chave = rng.choice(chaves)
+        if rng.random() < 0.3:
+            store.registrar_preco(chave, rng.uniform(10, 100), ts=ts)
+        else:
+            store.registrar_interacao(chave, rng.choice([0.0, 10.0, rng.uniform(0, 500)]), ts=ts)
+        consulta = rng.choice(list(store.segmentos))
+        assert store.features(consulta, ts=ts)['clv_estimate_percentile'] == _percentil_ingenuo(store, consulta, ts)
+
+
+def test_snapshot_concorrente_com_escritas(tmp_path):
+    caminho = tmp_path / "snap.json"
+    store = FeatureStore(caminho_snapshot=str(caminho), intervalo_snapshot_s=0.0)
+    erros = []
+
+    def escrever(inicio):
+        try:
+            for i in range(1000):
+                store.registrar_interacao(f"seg{inicio + i}", 1.0, ts=T0 + i)
+        except Exception as e:  # pragma: no cover
+            erros.append(e)
+
+    def snapshots():
+        try:
+            for _ in range(50):
+                store.snapshot_se_necessario()
+        except Exception as e:  # pragma: no cover
+            erros.append(e)
+
+    threads = [threading.Thread(target=escrever, args=(k * 10000,)) for k in range(2)]
+    threads.append(threading.Thread(target=snapshots))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not erros
+
+    store.salvar()
+    restaurado = FeatureStore(caminho_snapshot=str(caminho))
+    assert restaurado.carregar()
+    assert len(restaurado.segmentos) == 2000
+    assert restaurado.features("seg0", ts=T0)['clv_estimate_percentile'] == 1.0
+    assert len(json.loads(caminho.read_text())) == 2000
+
+
+def test_segmentos_expirados_sao_removidos(tmp_path):
+    store = FeatureStore(caminho_snapshot=str(tmp_path / "snap.json"))
+    store.registrar_interacao("antigo", 100.0, ts=T0)
+    store.registrar_preco("antigo", 50.0, ts=T0)
+    store.registrar_interacao("ativo", 10.0, ts=T0 + 80 * SEGUNDOS_POR_DIA)
+
+    ts = T0 + 91 * SEGUNDOS_POR_DIA
+    assert store.features("ativo", ts=ts)['clv_estimate_percentile'] == 1.0
+    assert "antigo" not in store.segmentos
+    assert store.features("antigo", ts=ts) is None
+    assert store._ranking == [10.0]
+
+    # Após restaurar um snapshot, a agenda de expiração continua valendo
+    store.salvar()
+    restaurado = FeatureStore(caminho_snapshot=str(tmp_path / "snap.json"))
+    restaurado.carregar()
+    restaurado.registrar_interacao("novo", 1.0, ts=T0 + 171 * SEGUNDOS_POR_DIA)
+    assert set(restaurado.segmentos) == {"novo"}
+    assert restaurado._ranking == [1.0]
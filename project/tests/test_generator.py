@@ -0,0 +1,37 @@
+import pandas as pd
+
+import Generator_NEW as gerador
+from economia import CENARIOS_ARTIGO
+
+
+def test_cache_reaproveita_cenarios_inalterados(tmp_path, monkeypatch):
+    monkeypatch.setattr(gerador, "CACHE_DIR", str(tmp_path / "cache"))
+    gerados = []
+    original = gerador.generate_scenario_block
+
+    def espiao(cenario, num_samples, seed):
+        gerados.append(cenario)
+        return original(cenario, num_samples, seed)
+    monkeypatch.setattr(gerador, "generate_scenario_block", espiao)
+
+    cenarios = [dict(c) for c in CENARIOS_ARTIGO[:3]]
+    primeiro = gerador.generate_datasets(cenarios, num_samples_per_scenario=20)
+    assert len(gerados) == 3
+
+    gerados.clear()
+    segundo = gerador.generate_datasets(cenarios, num_samples_per_scenario=20)
+    assert gerados == []
+    pd.testing.assert_frame_equal(primeiro, segundo)
+
+    # Só o cenário alterado é recalculado; os outros blocos vêm do cache
+    cenarios[1] = {**cenarios[1], "Budget": cenarios[1]["Budget"] * 2}
+    terceiro = gerador.generate_datasets(cenarios, num_samples_per_scenario=20)
+    assert gerados == [cenarios[1]]
+    pd.testing.assert_frame_equal(terceiro.iloc[:20], primeiro.iloc[:20])
+    pd.testing.assert_frame_equal(terceiro.iloc[40:], primeiro.iloc[40:])
+    assert not terceiro.iloc[20:40].equals(primeiro.iloc[20:40])
+
+    # Outro número de amostras é outra chave de cache
+    gerados.clear()
+    gerador.generate_datasets(cenarios[:1], num_samples_per_scenario=10)
+    assert gerados == cenarios[:1]
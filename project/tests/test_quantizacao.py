@@ -0,0 +1,115 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+import main
+import quantizacao
+from ensemble import EnsembleCQL
+from economia import numeric_features_base, numeric_features_memoria
+
+
+def test_estados_referencia_equivalem_ao_preprocess_dataframe(artefatos):
+    estados = main.gerar_estados_referencia("assinatura", n=8)
+    assert estados.shape == (8, len(main.models_state["colunas_estado_assinatura"]))
+
+    # Mesmo vocabulário pelo caminho pandas (OHE denso, sem .toarray())
+    ohe = main.models_state["ohe"]
+    linha = {c: cats[0] for c, cats in zip(ohe.feature_names_in_, ohe.categories_)}
+    linha.update({c: 1.0 for c in numeric_features_base + numeric_features_memoria})
+    colunas = {c: np.array([0]) for c in ohe.feature_names_in_}
+    colunas.update({c: np.array([1.0]) for c in numeric_features_base + numeric_features_memoria})
+    np.testing.assert_allclose(
+        main.preprocess_dataframe(pd.DataFrame([linha]), "assinatura"),
+        main.preprocess_columnar(colunas, "assinatura"),
+        rtol=1e-6,
+    )
+
+
+def _desempenho_fixo(mais_rapido):
+    def relatorio_desempenho(avaliar_fp32, avaliar_int8, estados_por_lote):
+        return {"latencia": {}, "mais_rapido": mais_rapido}
+    return relatorio_desempenho
+
+
+def test_calibracao_int8(artefatos, medicao_rapida):
+    main.aplicar_quantizacao(artefatos)
+    relatorio = main.models_state["relatorio_quantizacao"]
+
+    assert set(relatorio) == {nome for nome, _, _ in main.AGENTES_CQL.values()}
+    for nome, resultado in relatorio.items():
+        assert resultado["n_estados"] == main.N_ESTADOS_REFERENCIA
+        for metrica in ("preco", "var_5", "cvar_5"):
+            assert np.isfinite(resultado[metrica]["erro_relativo_max"])
+        assert set(resultado["latencia"]) == {"lote_1", "lote_64"}
+        assert resultado["memoria_bytes"]["int8"] < resultado["memoria_bytes"]["fp32"]
+        assert resultado["aprovado"] == (resultado["preciso"] and resultado["mais_rapido"])
+        assert resultado["servido_por"] == ("int8" if resultado["aprovado"] else "fp32")
+
+    # O modelo int8 (aprovado ou não) precisa servir predict e os quantis de risco
+    cql_int8 = quantizacao.carregar_quantizado(artefatos["cql_venda_unica"])
+    assert cql_int8.impl.modules.targ_q_funcs is None
+    estados = main.gerar_estados_referencia("venda_unica", n=16)
+    assert cql_int8.predict(estados).shape == (16, 1)
+
+    precos, var_5, cvar_5 = main.avaliar_politica(
+        cql_int8, main.models_state["scaler_acao"], main.models_state["scaler_recompensa"], estados
+    )
+    assert precos.shape == var_5.shape == cvar_5.shape == (16,)
+    assert np.all(cvar_5 <= var_5)
+
+
+def test_risco_usa_quantis_e_nao_a_media(artefatos):
+    cql = main.models_state["cql_venda_unica"]
+    estados = main.gerar_estados_referencia("venda_unica", n=16)
+    _, _, quantis = EnsembleCQL([cql]).avaliar(estados)
+    quantis = quantis[0]
+    assert quantis.shape == (16, 64)
+
+    _, var_5, cvar_5 = main.avaliar_politica(
+        cql, main.models_state["scaler_acao"], main.models_state["scaler_recompensa"], estados
+    )
+    media = main.models_state["scaler_recompensa"].inverse_transform(quantis.mean(axis=1, keepdims=True))[:, 0]
+    assert np.all(var_5 < media)
+    assert np.all(cvar_5 < var_5)
+
+
+def test_erro_acima_do_limiar_mantem_fp32(artefatos, medicao_rapida, monkeypatch):
+    monkeypatch.setattr(quantizacao, "LIMIAR_ERRO_RELATIVO", 0.0)
+    monkeypatch.setattr(quantizacao, "relatorio_desempenho", _desempenho_fixo(True))
+    originais = {nome: main.models_state[nome] for nome, _, _ in main.AGENTES_CQL.values()}
+
+    main.aplicar_quantizacao(artefatos)
+    for nome, cql in originais.items():
+        resultado = main.models_state["relatorio_quantizacao"][nome]
+        assert not resultado["preciso"] and not resultado["aprovado"]
+        assert resultado["servido_por"] == "fp32"
+        assert main.models_state[nome] is cql
+
+
+def test_int8_mais_lento_mantem_fp32(artefatos, medicao_rapida, monkeypatch):
+    monkeypatch.setattr(quantizacao, "LIMIAR_ERRO_RELATIVO", np.inf)
+    monkeypatch.setattr(quantizacao, "relatorio_desempenho", _desempenho_fixo(False))
+    cql = main.models_state["cql_venda_unica"]
+
+    main.aplicar_quantizacao(artefatos)
+    assert main.models_state["relatorio_quantizacao"]["cql_venda_unica"]["servido_por"] == "fp32"
+    assert main.models_state["cql_venda_unica"] is cql
+
+    monkeypatch.setattr(quantizacao, "relatorio_desempenho", _desempenho_fixo(True))
+    main.aplicar_quantizacao(artefatos)
+    assert main.models_state["relatorio_quantizacao"]["cql_venda_unica"]["servido_por"] == "int8"
+    assert main.models_state["cql_venda_unica"].impl.modules.targ_q_funcs is None
+
+
+def test_modo_quantizacao_invalido_cai_para_fp32():
+    resultado = subprocess.run(
+        [sys.executable, "-c", "import main; print(main.MODO_QUANTIZACAO)"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={**os.environ, "LOCAC_QUANTIZACAO": "bf16"},
+        capture_output=True, text=True, check=True,
+    )
+    assert resultado.stdout.strip().splitlines()[-1] == "fp32"
+    assert "não suportado" in resultado.stdout
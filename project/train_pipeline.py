@@ -2,6 +2,7 @@ import os
 import subprocess
 import sys
 import time
+from artefatos import ARTEFATOS_PIPELINE, MANIFESTOS_ENSEMBLE, escrever_manifesto, hash_config_mercado
 
 # Nomes exatos dos seus arquivos (conforme seus uploads)
 GENERATOR_SCRIPT = "Generator_NEW.py"
@@ -30,6 +31,15 @@ def run_pipeline():
         print(f"❌ Erro: Não foi possível encontrar {GENERATOR_SCRIPT}. Execute de dentro da pasta 'project' ou ajuste os caminhos.")
         sys.exit(1)
 
+    # Config de mercado usado neste treino (registrado no manifesto ao final)
+    config_hash = hash_config_mercado()
+
+    # Ensembles treinados sobre os buffers anteriores ficam obsoletos
+    for manifesto in MANIFESTOS_ENSEMBLE:
+        if os.path.exists(manifesto):
+            os.remove(manifesto)
+            print(f"🗑️  {manifesto} removido (será re-treinado com os novos buffers).")
+
     # 1. Gerar Dados (Gêmeo Digital)
     run_command(f"{sys.executable} {GENERATOR_SCRIPT}", "1. Gerando Dados Sintéticos e Scalers")
 
@@ -52,6 +62,9 @@ def run_pipeline():
         "4. Treinando RL Assinatura (LTV)"
     )
 
+    # 5. Manifesto de integridade (validado por hash no start.py)
+    escrever_manifesto(ARTEFATOS_PIPELINE, config_hash=config_hash)
+
     print("\n" + "="*60)
     print("🎉 PIPELINE CONCLUÍDO: Todos os modelos foram treinados e salvos.")
     print("="*60)
@@ -0,0 +1,110 @@
+"""
+Treino Paralelo Multi-Seed dos Agentes CQL
+Treina N sementes do mesmo agente em processos separados (um por núcleo,
+com limite de threads do torch por processo) e grava um manifesto JSON
+com os membros do ensemble para o main.py, amarrado ao hash do buffer usado.
+
+Uso: python treino_ensemble.py venda_unica --seeds 42 43 44 45
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+
+from artefatos import hash_arquivo, registrar_no_manifesto
+
+N_STEPS = 50000
+STEPS_PER_EPOCH = 1000
+
+# Mesmos hiperparâmetros dos notebooks de treino
+AGENTES = {
+    "venda_unica": {"buffer": "rl_offline_buffer.h5", "gamma": 0.98, "prefixo": "modelo_rl_final"},
+    "assinatura": {"buffer": "rl_assinatura_buffer.h5", "gamma": 0.99, "prefixo": "modelo_rl_assinatura"},
+}
+
+
+def _limitar_threads(n_threads):
+    import torch
+    torch.set_num_threads(n_threads)
+    torch.set_num_interop_threads(1)
+
+
+def treinar_semente(tipo, seed, n_steps=N_STEPS):
+    import d3rlpy
+    import numpy as np
+    from d3rlpy.algos import CQLConfig
+    from d3rlpy.models import QRQFunctionFactory
+    from d3rlpy.dataset import ReplayBuffer, FIFOBuffer
+
+    agente = AGENTES[tipo]
+    d3rlpy.seed(seed)
+    np.random.seed(seed)
+
+    with open(agente["buffer"], "rb") as f:
+        dataset = ReplayBuffer.load(f, FIFOBuffer(limit=200000))
+
+    cql = CQLConfig(
+        batch_size=256,
+        gamma=agente["gamma"],
+        observation_scaler=None,
+        action_scaler=None,
+        reward_scaler=None,
+        alpha_learning_rate=1e-4,
+        actor_learning_rate=1e-4,
+        critic_learning_rate=3e-4,
+        conservative_weight=5.0,
+        q_func_factory=QRQFunctionFactory(n_quantiles=64)
+    ).create(device="cpu")
+
+    start = time.time()
+    cql.fit(
+        dataset,
+        n_steps=n_steps,
+        n_steps_per_epoch=STEPS_PER_EPOCH,
+        experiment_name=f"cql_{tipo}_seed{seed}",
+        with_timestamp=False,
+        show_progress=False,
+    )
+    caminho = f"{agente['prefixo']}_seed{seed}.pt"
+    cql.save(caminho)
+    print(f"   ✅ [{tipo}] seed {seed} concluída em {time.time() - start:.1f}s -> {caminho}")
+    return caminho
+
+
+def treinar_ensemble(tipo, seeds, n_workers=None, n_steps=N_STEPS):
+    n_workers = n_workers or min(len(seeds), os.cpu_count() or 1)
+    n_threads = max(1, (os.cpu_count() or 1) // n_workers)
+    buffer = AGENTES[tipo]["buffer"]
+    buffer_hash = hash_arquivo(buffer)
+    print(f"🚀 Treinando {len(seeds)} sementes de '{tipo}' em {n_workers} processos ({n_threads} threads cada)...")
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_limitar_threads,
+        initargs=(n_threads,),
+    ) as pool:
+        membros = list(pool.map(treinar_semente, [tipo] * len(seeds), seeds, [n_steps] * len(seeds)))
+
+    manifesto = f"ensemble_{tipo}.json"
+    with open(manifesto, "w") as f:
+        json.dump({
+            "tipo": tipo, "seeds": list(seeds), "membros": membros,
+            "buffer": buffer, "buffer_hash": buffer_hash,
+        }, f, indent=4)
+    registrar_no_manifesto([manifesto] + membros)
+    print(f"🎉 Ensemble salvo em '{manifesto}'.")
+    return manifesto
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Treino paralelo multi-seed dos agentes CQL")
+    parser.add_argument("tipo", choices=sorted(AGENTES))
+    parser.add_argument("--seeds", type=int, nargs="+", default=[42, 43, 44, 45])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--steps", type=int, default=N_STEPS)
+    args = parser.parse_args()
+    treinar_ensemble(args.tipo, args.seeds, args.workers, args.steps)
@@ -6,20 +6,19 @@ import subprocess
 # Caminhos
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_DIR = os.path.join(ROOT_DIR, "project")
-REQUIRED_MODELS = [
-    "modelo_rl_final.pt",
-    "modelo_rl_assinatura.pt",
-    "sl_profit_regressor_model.joblib",
-    "scaler_estado.joblib" # Verifica um scaler também para garantir
-]
+sys.path.insert(0, PROJECT_DIR)
+from artefatos import ARTEFATOS_PIPELINE, inicializar_manifesto, validar_manifesto
 
 def check_artifacts():
-    """Verifica se os modelos necessários existem."""
-    missing = []
-    for file in REQUIRED_MODELS:
-        if not os.path.exists(os.path.join(PROJECT_DIR, file)):
-            missing.append(file)
-    return missing
+    """Verifica os artefatos do pipeline pelo hash registrado no manifesto.
+
+    Falha se algum arquivo falta, foi alterado, ou se o config_market.json mudou
+    desde o último treino. Instalações anteriores ao manifesto (artefatos
+    presentes, manifesto ausente) ganham um manifesto em vez de re-treinar.
+    """
+    if inicializar_manifesto(ARTEFATOS_PIPELINE):
+        print("📝 Manifesto de artefatos criado a partir dos arquivos existentes.")
+    return validar_manifesto(ARTEFATOS_PIPELINE)
 
 def main():
     # 1. Entra na pasta do projeto
@@ -34,7 +33,7 @@ def main():
     missing_files = check_artifacts()
     
     if missing_files:
-        print("\n⚠️  AVISO: Arquivos de IA essenciais não encontrados:")
+        print("\n⚠️  AVISO: Arquivos de IA essenciais ausentes ou desatualizados:")
         for f in missing_files:
             print(f"   - {f}")
         print("\n⚙️  Iniciando AUTO-CONFIGURAÇÃO (Isso acontece apenas na primeira vez)...")